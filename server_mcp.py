@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
+import fnmatch
+import heapq
 import json
 import os
 import sys
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 import mimetypes
 import re
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from stat import S_ISDIR, S_ISREG
 
 # Set up logging
 logging.basicConfig(
@@ -15,24 +23,211 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Build/cache directories that traversals never descend into
+_SKIP_DIRS = frozenset({
+    '.git', 'node_modules', '__pycache__', '.venv', 'venv',
+    'target', 'build', 'dist', '.cache', 'tmp', 'temp'
+})
+
+# Content search also skips generated output and logs
+_CONTENT_SEARCH_SKIP_DIRS = _SKIP_DIRS | {'.next', 'coverage', '.nyc_output', 'logs', '.logs'}
+
+# Hidden entries that get_structure still shows
+_VISIBLE_DOTFILES = frozenset({'.env', '.gitignore', '.dockerignore'})
+
+# Extensions that are always treated as binary without reading the file
+_BINARY_EXTENSIONS = frozenset({
+    '.exe', '.dll', '.so', '.dylib', '.bin', '.dat', '.db', '.sqlite',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.webp',
+    '.mp3', '.mp4', '.avi', '.mov', '.wav', '.flac', '.ogg',
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2',
+    '.woff', '.woff2', '.ttf', '.otf', '.eot'
+})
+
+# Extensions that are always treated as text, skipping the content sniff
+_TEXT_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.tsx', '.jsx', '.md', '.rst', '.txt',
+    '.json', '.yml', '.yaml', '.toml', '.ini', '.cfg',
+    '.html', '.css', '.scss', '.c', '.cc', '.cpp', '.h', '.hpp',
+    '.rs', '.go', '.java', '.kt', '.swift', '.dart', '.rb', '.php', '.sh', '.sql', '.xml'
+})
+
+# Lines that are empty or whitespace-only
+_BLANK_LINE_RE = re.compile(r'^[^\S\n]*$', re.MULTILINE)
+
+# Version specifiers recognised in requirements.txt lines
+_VERSION_SPECIFIER_RE = re.compile(r'==|>=|<=|~=|!=|>|<')
+
+# Directory categories, each matched when a keyword occurs in the lowercased name
+_DIRECTORY_CLASSES = (
+    ("source", ("src", "lib", "app", "source")),
+    ("config", ("config", "configs", "settings", "conf")),
+    ("assets", ("assets", "static", "public", "resources", "images", "img")),
+    ("tests", ("test", "tests", "spec", "specs", "__tests__")),
+    ("docs", ("docs", "documentation", "doc")),
+    ("build", ("build", "dist", "out", "target", "bin")),
+    ("dependencies", ("node_modules", "vendor", "packages")),
+)
+
+# Entry point file types, matched the same way against the file name
+_ENTRY_POINT_TYPES = (
+    ("main_entry", ("main", "index", "app")),
+    ("configuration", ("config", "settings")),
+    ("routing", ("route", "url", "api")),
+    ("testing", ("test", "spec")),
+    ("build_system", ("docker", "make", "build")),
+)
+
+# Entry point file patterns, most important category first
+_ENTRY_POINT_PATTERNS = {
+    "main_files": ["main.*", "index.*", "app.*", "server.*", "run.*"],
+    "config_files": ["*.config.*", "config.*", "settings.*", ".env*"],
+    "route_files": ["routes.*", "urls.py", "router.*", "api.*"],
+    "build_files": ["Dockerfile", "docker-compose.*", "Makefile", "build.*"],
+    "test_files": ["test.*", "*test.*", "spec.*", "*spec.*"]
+}
+
+# One alternation per category, matched against lowercased file names
+_ENTRY_POINT_REGEXES = tuple(
+    (category, re.compile('|'.join(fnmatch.translate(p.lower()) for p in file_patterns)))
+    for category, file_patterns in _ENTRY_POINT_PATTERNS.items()
+)
+
+# build.gradle dependency lines: the configuration name, then the first quoted string on the line
+_GRADLE_DEPENDENCY_RE = re.compile(
+    r'^[^\S\n]*(?P<kind>implementation|compile|api|testImplementation|androidTestImplementation)'
+    r'[^\n]*?["\'](?P<dependency>[^"\'\n]+)["\']',
+    re.MULTILINE
+)
+
+# go.mod require directives: a parenthesised block, or a single "require module version" line
+_GO_REQUIRE_RE = re.compile(
+    r'^[ \t]*require[ \t]*\((?P<block>.*?)^[ \t]*\)'
+    r'|^[ \t]*require[ \t]+(?P<module>[^\s(]\S*)[ \t]+(?P<version>\S+)',
+    re.MULTILINE | re.DOTALL
+)
+
+# "module version" lines inside a require block, skipping // comment lines
+_GO_MODULE_LINE_RE = re.compile(r'^[ \t]*(?!//)(\S+)[ \t]+(\S+)', re.MULTILINE)
+
+# stat() failures that Path.exists() reports as a missing path
+_MISSING_PATH_ERRORS = (FileNotFoundError, NotADirectoryError, ValueError)
+
+# Byte order marks identifying UTF-16 text (UTF-8 needs no sniffing)
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
+# Tab, newline, carriage return and printable ASCII, used to sniff binary content
+_PRINTABLE_BYTES = bytes(range(32, 127)) + b'\t\n\r'
+
+
+def _file_suffix(name: str) -> str:
+    """Same as Path(name).suffix, without building a Path"""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ''
+
+
+def _guess_type(name: str) -> tuple:
+    """mimetypes.guess_type for a file name, memoized by extension"""
+    base, ext = os.path.splitext(name)
+    # Compression suffixes (.gz, .tgz, ...) also depend on the extension before them
+    if (ext in mimetypes.suffix_map or ext in mimetypes.encodings_map
+            or ext.lower() in mimetypes.encodings_map):
+        ext = os.path.splitext(base)[1] + ext
+    return _guess_type_for_suffix(ext)
+
+
+@lru_cache(maxsize=512)
+def _guess_type_for_suffix(suffix: str) -> tuple:
+    """Guess the MIME type and encoding for a file suffix"""
+    return mimetypes.guess_type('file' + suffix)
+
+
+def _classify_name(name_lower: str, classes: tuple) -> str:
+    """Return the first category with a keyword in name_lower ("other" if none match)"""
+    for category, keywords in classes:
+        if any(keyword in name_lower for keyword in keywords):
+            return category
+    return "other"
+
+
+# Exact keyword names resolve without scanning every category
+_DIRECTORY_CLASS_BY_NAME = {
+    keyword: _classify_name(keyword, _DIRECTORY_CLASSES)
+    for _, keywords in _DIRECTORY_CLASSES for keyword in keywords
+}
+
+
+def _scandir_entries(path: str) -> Optional[List[os.DirEntry]]:
+    """List a directory with os.scandir, or None if it can't be read"""
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _sniff_binary(path: str, mtime: float, size: int) -> bool:
+    """Sample the first bytes of a file to guess whether it is binary"""
+    # mtime and size are only part of the cache key, so edited files get re-sniffed
+    try:
+        with open(path, 'rb') as f:
+            sample = f.read(512)
+            # Check for null bytes (common in binary files)
+            if b'\x00' in sample:
+                return True
+            # Check for high ratio of non-printable characters
+            printable_chars = len(sample) - len(sample.translate(None, _PRINTABLE_BYTES))
+            if len(sample) > 0 and printable_chars / len(sample) < 0.7:
+                return True
+    except Exception:
+        return True
+    
+    return False
+
+
 class UniversalProjectMCP:
     def __init__(self):
         # Start with current directory, but allow changing via method
         self.project_root = Path(".").resolve()
         self._config_file = Path.home() / ".universal_mcp_config.json"
+        # Parsed dependency files keyed by path, stored as (file mtime_ns, result)
+        self._dependency_cache: Dict[str, tuple] = {}
+        # Project root as last read from or written to the config file
+        self._last_saved_root: Optional[str] = None
+        # Tool name -> bound method, looked up once per tools/call
+        self._dispatch = {
+            "set_project_path": self.set_project_path,
+            "get_project_path": self.get_project_path,
+            "get_structure": self.get_structure,
+            "read_file": self.read_file,
+            "search_files": self.search_files,
+            "search_in_files": self.search_in_files,
+            "list_directory": self.list_directory,
+            "get_file_info": self.get_file_info,
+            "get_project_summary": self.get_project_summary,
+            "get_dependencies": self.get_dependencies,
+            "find_entry_points": self.find_entry_points,
+        }
         self._load_config()
         
     def _load_config(self):
         """Load saved configuration"""
         try:
-            if self._config_file.exists():
-                with open(self._config_file, 'r') as f:
-                    config = json.load(f)
-                    if 'project_root' in config:
-                        self.project_root = Path(config['project_root']).resolve()
-                        logging.info(f"Loaded project root from config: {self.project_root}")
+            # Opening directly replaces a separate exists() probe
+            with open(self._config_file, 'r') as f:
+                config = json.load(f)
+                if 'project_root' in config:
+                    self.project_root = Path(config['project_root']).resolve()
+                    self._last_saved_root = config['project_root']
+                    logging.info("Loaded project root from config: %s", self.project_root)
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            logging.error(f"Error loading config: {e}")
+            logging.error("Error loading config: %s", e)
     
     def _save_config(self):
         """Save current configuration"""
@@ -40,25 +235,36 @@ class UniversalProjectMCP:
             config = {
                 'project_root': str(self.project_root)
             }
-            with open(self._config_file, 'w') as f:
+            if config['project_root'] == self._last_saved_root:
+                return
+            
+            # Write to a temp file and swap it in, so a crash never leaves a torn config
+            tmp_file = self._config_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
                 json.dump(config, f, indent=2)
-            logging.info(f"Saved config: {config}")
+            os.replace(tmp_file, self._config_file)
+            self._last_saved_root = config['project_root']
+            logging.info("Saved config: %s", config)
         except Exception as e:
-            logging.error(f"Error saving config: {e}")
+            logging.error("Error saving config: %s", e)
     
     def set_project_path(self, path: str) -> Dict[str, Any]:
         """Set the project root path and save it"""
         try:
             new_path = Path(path).resolve()
             
-            if not new_path.exists():
+            # One stat answers both existence and type
+            try:
+                stat = new_path.stat()
+            except _MISSING_PATH_ERRORS:
                 return {"error": f"Path does not exist: {path}"}
             
-            if not new_path.is_dir():
+            if not S_ISDIR(stat.st_mode):
                 return {"error": f"Path is not a directory: {path}"}
             
             old_path = str(self.project_root)
             self.project_root = new_path
+            self._clear_caches()
             self._save_config()
             
             return {
@@ -73,48 +279,124 @@ class UniversalProjectMCP:
     
     def get_project_path(self) -> Dict[str, Any]:
         """Get current project path"""
+        # One stat answers both flags
+        try:
+            mode = self.project_root.stat().st_mode
+        except (OSError, ValueError):
+            mode = None
         return {
             "project_path": str(self.project_root),
-            "exists": self.project_root.exists(),
-            "is_directory": self.project_root.is_dir()
+            "exists": mode is not None,
+            "is_directory": mode is not None and S_ISDIR(mode)
         }
         
     def get_structure(self, path: str = "", max_depth: int = 2) -> Dict[str, Any]:
         """Get project directory structure with configurable depth"""
         base_path = self.project_root / path if path else self.project_root
         
-        def build_tree(current_path: Path, current_depth: int = 0) -> Dict[str, Any]:
+        # One stat tells build_tree whether the base exists and what it is
+        base_stat = None
+        try:
+            base_stat = base_path.stat()
+        except (OSError, ValueError) as e:
+            base_stat_error = e
+        
+        def build_entry(entry: os.DirEntry, current_depth: int, pending: deque) -> Dict[str, Any]:
             if current_depth >= max_depth:
                 return {"type": "directory", "truncated": True}
             
             try:
-                if not current_path.exists():
-                    return {"error": "Path not found"}
+                if entry.is_dir():
+                    # Filled in when the queue reaches it
+                    node = {"type": "directory", "children": {}}
+                    pending.append((node, entry.path, current_depth))
+                    return node
+                
+                stat = entry.stat()
+                return {
+                    "type": "file",
+                    "size": stat.st_size,
+                    "extension": _file_suffix(entry.name)
+                }
+                
+            except PermissionError:
+                return {"type": "directory", "error": "Permission denied"}
+            except Exception as e:
+                return {"error": str(e)}
+        
+        def fill_directory(node: Dict[str, Any], dir_path: str, current_depth: int, pending: deque):
+            # Directory processing; DirEntry keeps the dirent type, so no stat per entry
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+            
+            # Partition into directories and files in one pass
+            dirs = []
+            files = []
+            for entry in entries:
+                # Skip hidden files/dirs unless explicitly requested
+                if entry.name.startswith('.') and entry.name not in _VISIBLE_DOTFILES:
+                    continue
+                try:
+                    if entry.is_dir():
+                        dirs.append(entry)
+                    elif entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    continue
+            
+            # Sort: directories first, then files, alphabetically within each group
+            dirs.sort(key=lambda e: e.name.lower())
+            files.sort(key=lambda e: e.name.lower())
+            
+            children = node["children"]
+            for entry in dirs + files:
+                children[entry.name] = build_entry(entry, current_depth + 1, pending)
+        
+        def fill_node(node: Dict[str, Any], dir_path: str, current_depth: int, pending: deque):
+            try:
+                fill_directory(node, dir_path, current_depth, pending)
+            except PermissionError:
+                node.clear()
+                node.update({"type": "directory", "error": "Permission denied"})
+            except Exception as e:
+                node.clear()
+                node.update({"error": str(e)})
+        
+        def build_directory(dir_path: str) -> Dict[str, Any]:
+            # Breadth-first, one level at a time instead of recursing per directory
+            root = {"type": "directory", "children": {}}
+            level = [(root, dir_path, 0)]
+            while level:
+                pending = deque()
+                if len(level) == 1:
+                    fill_node(*level[0], pending)
+                else:
+                    # Directories on one level are independent and mostly wait on
+                    # scandir/stat, so they are scanned on a small thread pool
+                    with ThreadPoolExecutor(max_workers=min(8, len(level))) as pool:
+                        for item in level:
+                            pool.submit(fill_node, *item, pending)
+                level = pending
+            return root
+        
+        def build_tree(current_path: Path) -> Dict[str, Any]:
+            if max_depth <= 0:
+                return {"type": "directory", "truncated": True}
+            
+            try:
+                if base_stat is None:
+                    if isinstance(base_stat_error, _MISSING_PATH_ERRORS):
+                        return {"error": "Path not found"}
+                    raise base_stat_error
                 
-                if current_path.is_file():
-                    stat = current_path.stat()
+                if S_ISREG(base_stat.st_mode):
                     return {
                         "type": "file",
-                        "size": stat.st_size,
+                        "size": base_stat.st_size,
                         "extension": current_path.suffix
                     }
                 
-                # Directory processing
-                items = list(current_path.iterdir())
-                result = {"type": "directory", "children": {}}
-                
-                # Sort: directories first, then files, alphabetically within each group
-                dirs = sorted([item for item in items if item.is_dir()], key=lambda x: x.name.lower())
-                files = sorted([item for item in items if item.is_file()], key=lambda x: x.name.lower())
-                
-                for item in dirs + files:
-                    # Skip hidden files/dirs unless explicitly requested
-                    if item.name.startswith('.') and item.name not in {'.env', '.gitignore', '.dockerignore'}:
-                        continue
-                        
-                    result["children"][item.name] = build_tree(item, current_depth + 1)
-                
-                return result
+                return build_directory(str(current_path))
                 
             except PermissionError:
                 return {"type": "directory", "error": "Permission denied"}
@@ -133,51 +415,48 @@ class UniversalProjectMCP:
         try:
             full_path = self.project_root / file_path
             
-            if not full_path.exists():
+            # One stat answers existence, type and size
+            try:
+                stat = full_path.stat()
+            except _MISSING_PATH_ERRORS:
                 return {"error": f"File not found: {file_path}"}
             
-            if not full_path.is_file():
+            if not S_ISREG(stat.st_mode):
                 return {"error": f"Path is not a file: {file_path}"}
             
             # Check file size (limit to 5MB)
-            file_size = full_path.stat().st_size
+            file_size = stat.st_size
             if file_size > 5 * 1024 * 1024:
                 return {"error": f"File too large ({file_size} bytes). Maximum 5MB allowed."}
             
             # Detect MIME type
-            mime_type, encoding = mimetypes.guess_type(str(full_path))
+            mime_type, encoding = _guess_type(full_path.name)
             
-            # Try to read as text
-            encodings_to_try = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
-            content = None
-            used_encoding = None
+            start_idx = max(0, start_line - 1)
             
-            for enc in encodings_to_try:
+            # Read as text, keeping only the requested lines in memory. The
+            # encoding comes from the BOM; non-UTF-8 text falls back to latin-1
+            try:
+                with open(full_path, 'rb') as f:
+                    used_encoding = self._sniff_encoding(f.read(2))
                 try:
-                    with open(full_path, 'r', encoding=enc) as f:
-                        content = f.read()
-                    used_encoding = enc
-                    break
-                except UnicodeDecodeError:
-                    continue
-                except Exception:
-                    break
-            
-            if content is None:
+                    selected_content, total_lines = self._read_line_range(
+                        full_path, used_encoding, start_idx, end_line
+                    )
+                except UnicodeError:
+                    used_encoding = 'latin-1'
+                    selected_content, total_lines = self._read_line_range(
+                        full_path, used_encoding, start_idx, end_line
+                    )
+            except Exception:
                 return {"error": "Cannot read file as text (binary file or encoding issue)"}
             
-            lines = content.splitlines(keepends=True)
-            total_lines = len(lines)
-            
             # Handle line range
             if end_line is None:
                 end_line = total_lines
             
-            start_idx = max(0, start_line - 1)
             end_idx = min(total_lines, end_line)
             
-            selected_content = "".join(lines[start_idx:end_idx])
-            
             return {
                 "file_path": file_path,
                 "full_path": str(full_path),
@@ -193,75 +472,121 @@ class UniversalProjectMCP:
         except Exception as e:
             return {"error": f"Error reading file: {str(e)}"}
 
-    def search_files(self, pattern: str = "*", path: str = "", include_content: bool = False, 
-                    file_extensions: Optional[List[str]] = None, max_results: int = 100) -> List[Dict[str, Any]]:
-        """Search for files by pattern"""
-        import fnmatch
+    def _sniff_encoding(self, head: bytes) -> str:
+        """Pick the encoding to try first from a file's leading bytes"""
+        if head[:2] in _UTF16_BOMS:
+            return 'utf-16'
+        return 'utf-8'
+
+    def _decode_text(self, data: bytes) -> tuple:
+        """Decode raw file bytes, returning (content, encoding)"""
+        encoding = self._sniff_encoding(data)
+        try:
+            content = data.decode(encoding)
+        except UnicodeDecodeError:
+            encoding = 'latin-1'  # Decodes any byte sequence
+            content = data.decode(encoding)
+        
+        # Match text-mode reads, which translate \r\n and \r to \n
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         
+        return content, encoding
+
+    def _read_line_range(self, full_path: Path, encoding: str, start_idx: int,
+                         end_line: Optional[int]) -> tuple:
+        """Stream a file, returning lines [start_idx, end_line) and the total line count"""
+        with open(full_path, 'r', encoding=encoding) as f:
+            skipped = sum(1 for _ in islice(f, start_idx))
+            if end_line is None:
+                selected = f.readlines()
+            else:
+                selected = list(islice(f, max(0, end_line - start_idx)))
+            
+            # Count the remaining lines without keeping them; this also
+            # decodes the rest of the file so encoding errors still surface
+            remaining = 0
+            last_char = ''
+            for chunk in iter(lambda: f.read(1024 * 1024), ''):
+                remaining += chunk.count('\n')
+                last_char = chunk[-1]
+            if last_char and last_char != '\n':
+                remaining += 1
+        
+        return "".join(selected), skipped + len(selected) + remaining
+
+    def search_files(self, pattern: str = "*", path: str = "", include_content: bool = False, 
+                    file_extensions: Optional[List[str]] = None, max_results: int = 100,
+                    max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search for files by pattern, optionally limited to max_depth directory levels"""
         search_path = self.project_root / path if path else self.project_root
+        root_prefix = os.path.join(str(self.project_root), "")
         results = []
         count = 0
+        # (result, file path) pairs whose content still has to be searched
+        content_pending = []
+        
+        # Compile the name pattern once instead of per file
+        pattern_lower = pattern.lower()
+        name_regex = re.compile(fnmatch.translate(pattern_lower))
+        content_keyword = pattern_lower.replace('*', '')
+        # Byte form for the ASCII prefilter; newlines are normalised after decoding, so skip it then
+        if '\n' in content_keyword or '\r' in content_keyword:
+            content_bytes = None
+        else:
+            content_bytes = content_keyword.encode('utf-8', errors='surrogatepass')
+        extension_set = self._normalize_extensions(file_extensions)
         
         try:
-            for root, dirs, files in os.walk(search_path):
-                # Skip common build/cache directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '.git', 'node_modules', '__pycache__', '.venv', 'venv', 
-                    'target', 'build', 'dist', '.cache', 'tmp', 'temp'
-                }]
+            # Result paths are sliced off root_prefix, so a search path that normalises
+            # to outside the project root fails the same way relative_to always did
+            search_dir = os.path.normpath(search_path)
+            Path(search_dir).relative_to(self.project_root)
+            
+            for entry in self._scantree(search_dir, _SKIP_DIRS, max_depth):
+                if count >= max_results:
+                    break
+                    
+                file = entry.name
+                relative_path = entry.path[len(root_prefix):]
+                extension = _file_suffix(file)
                 
-                for file in files:
-                    if count >= max_results:
-                        break
+                # Filter by extension if specified
+                if extension_set and extension.lower() not in extension_set:
+                    continue
+                
+                # Check if filename matches pattern
+                if name_regex.match(file.lower()):
+                    try:
+                        stat = entry.stat()
+                        result = {
+                            "path": relative_path,
+                            "name": file,
+                            "size": stat.st_size,
+                            "extension": extension,
+                            "directory": os.path.dirname(relative_path) or "."
+                        }
                         
-                    file_path = Path(root) / file
-                    relative_path = file_path.relative_to(self.project_root)
-                    
-                    # Filter by extension if specified
-                    if file_extensions and file_path.suffix.lower() not in file_extensions:
+                        # Search in content if requested and file is small enough
+                        if include_content and stat.st_size < 1024 * 1024:  # Max 1MB for content search
+                            content_pending.append((result, entry.path))
+                        
+                        results.append(result)
+                        count += 1
+                        
+                    except Exception:
                         continue
-                    
-                    # Check if filename matches pattern
-                    if fnmatch.fnmatch(file.lower(), pattern.lower()):
-                        try:
-                            stat = file_path.stat()
-                            result = {
-                                "path": str(relative_path),
-                                "name": file,
-                                "size": stat.st_size,
-                                "extension": file_path.suffix,
-                                "directory": str(relative_path.parent)
-                            }
-                            
-                            # Search in content if requested and file is small enough
-                            if include_content and stat.st_size < 1024 * 1024:  # Max 1MB for content search
-                                try:
-                                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                        content = f.read()
-                                        if pattern.lower().replace('*', '') in content.lower():
-                                            # Find matching lines
-                                            lines = content.split('\n')
-                                            matches = []
-                                            for i, line in enumerate(lines, 1):
-                                                if pattern.lower().replace('*', '') in line.lower():
-                                                    matches.append({
-                                                        "line_number": i,
-                                                        "content": line.strip()
-                                                    })
-                                                    if len(matches) >= 5:  # Limit matches per file
-                                                        break
-                                            result["content_matches"] = matches
-                                except:
-                                    pass  # Skip files that can't be read
-                            
-                            results.append(result)
-                            count += 1
-                            
-                        except Exception:
-                            continue
-                            
-                if count >= max_results:
-                    break
+            
+            # Content reads are mostly I/O, so the matched files are scanned concurrently
+            if content_pending:
+                with ThreadPoolExecutor(max_workers=min(8, len(content_pending))) as executor:
+                    scans = executor.map(
+                        lambda item: self._scan_content_lines(item[1], content_keyword, content_bytes),
+                        content_pending
+                    )
+                    for (result, _), content_matches in zip(content_pending, scans):
+                        if content_matches is not None:
+                            result["content_matches"] = content_matches
             
             return sorted(results, key=lambda x: (x['directory'], x['name']))
             
@@ -272,9 +597,8 @@ class UniversalProjectMCP:
                     max_results: int = 50, case_sensitive: bool = False, 
                     max_matches_per_file: int = 10) -> Dict[str, Any]:
         """Search for keyword within file contents and return matching files with context"""
-        import fnmatch
-        
         search_path = self.project_root / path if path else self.project_root
+        root_prefix = os.path.join(str(self.project_root), "")
         results = {
             "keyword": keyword,
             "search_path": str(search_path.relative_to(self.project_root)) if path else "",
@@ -287,136 +611,59 @@ class UniversalProjectMCP:
         if not keyword.strip():
             return {"error": "Keyword cannot be empty"}
         
-        # Prepare keyword for search
-        search_keyword = keyword if case_sensitive else keyword.lower()
+        extension_set = self._normalize_extensions(file_extensions)
+        
+        # Non-UTF-16 files decode as UTF-8 or latin-1, so a file can only match
+        # if it contains the keyword's bytes in one of those encodings. Files
+        # without them are skipped before decoding anything.
+        keyword_bytes = None
+        if '\n' not in keyword and '\r' not in keyword:
+            if keyword.isascii():
+                keyword_bytes = (keyword.encode('ascii') if case_sensitive
+                                 else keyword.encode('ascii').lower(),)
+            elif case_sensitive:
+                keyword_bytes = (keyword.encode('utf-8', errors='surrogatepass'),)
+                try:
+                    keyword_bytes += (keyword.encode('latin-1'),)
+                except UnicodeEncodeError:
+                    pass
         
         try:
-            for root, dirs, files in os.walk(search_path):
-                # Skip common build/cache directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '.git', 'node_modules', '__pycache__', '.venv', 'venv', 
-                    'target', 'build', 'dist', '.cache', 'tmp', 'temp', '.next',
-                    'coverage', '.nyc_output', 'logs', '.logs'
-                }]
-                
-                for file in files:
+            def record(outcome: tuple):
+                searched, file_result = outcome
+                if searched:
+                    results["total_files_searched"] += 1
+                if file_result:
+                    results["files_with_matches"] += 1
+                    results["matches"].append(file_result)
+            
+            # Files are read and scanned on worker threads (I/O releases the GIL),
+            # but outcomes are consumed in traversal order so results match a
+            # sequential scan. A bounded window lets the walk stop at max_results.
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            pending = deque()
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for entry in self._scantree(search_path, _CONTENT_SEARCH_SKIP_DIRS):
                     if len(results["matches"]) >= max_results:
                         break
-                        
-                    file_path = Path(root) / file
-                    relative_path = file_path.relative_to(self.project_root)
                     
                     # Filter by extension if specified
-                    if file_extensions:
-                        if not any(file_path.suffix.lower() == ext.lower() if ext.startswith('.') 
-                                else file_path.suffix.lower() == f'.{ext.lower()}' 
-                                for ext in file_extensions):
-                            continue
-                    
-                    # Skip binary files and very large files
-                    try:
-                        stat = file_path.stat()
-                        if stat.st_size > 10 * 1024 * 1024:  # Skip files larger than 10MB
-                            continue
-                            
-                        # Check if file might be binary
-                        if self._is_likely_binary_file(file_path):
-                            continue
-                            
-                    except Exception:
+                    if extension_set and _file_suffix(entry.name).lower() not in extension_set:
                         continue
                     
-                    results["total_files_searched"] += 1
-                    
-                    # Search in file content
-                    try:
-                        encodings_to_try = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
-                        content = None
-                        used_encoding = None
-                        
-                        for enc in encodings_to_try:
-                            try:
-                                with open(file_path, 'r', encoding=enc) as f:
-                                    content = f.read()
-                                used_encoding = enc
-                                break
-                            except UnicodeDecodeError:
-                                continue
-                            except Exception:
-                                break
-                        
-                        if content is None:
-                            continue
-                        
-                        # Search for keyword
-                        search_content = content if case_sensitive else content.lower()
-                        
-                        if search_keyword in search_content:
-                            results["files_with_matches"] += 1
-                            
-                            # Find all matches with line numbers and context
-                            lines = content.split('\n')
-                            matches_in_file = []
-                            
-                            for line_num, line in enumerate(lines, 1):
-                                search_line = line if case_sensitive else line.lower()
-                                
-                                if search_keyword in search_line:
-                                    # Find all occurrences in this line
-                                    start = 0
-                                    while True:
-                                        pos = search_line.find(search_keyword, start)
-                                        if pos == -1:
-                                            break
-                                        
-                                        # Get context around the match
-                                        context_start = max(0, pos - 50)
-                                        context_end = min(len(line), pos + len(keyword) + 50)
-                                        context = line[context_start:context_end]
-                                        
-                                        # Highlight the match
-                                        if not case_sensitive:
-                                            # Find the actual match in original case
-                                            actual_match_start = line.lower().find(search_keyword, pos)
-                                            if actual_match_start != -1:
-                                                actual_match = line[actual_match_start:actual_match_start + len(keyword)]
-                                            else:
-                                                actual_match = keyword
-                                        else:
-                                            actual_match = keyword
-                                        
-                                        matches_in_file.append({
-                                            "line_number": line_num,
-                                            "column": pos + 1,
-                                            "line_content": line.strip(),
-                                            "context": context,
-                                            "matched_text": actual_match
-                                        })
-                                        
-                                        start = pos + 1
-                                        
-                                        if len(matches_in_file) >= max_matches_per_file:
-                                            break
-                                    
-                                    if len(matches_in_file) >= max_matches_per_file:
-                                        break
-                            
-                            if matches_in_file:
-                                results["matches"].append({
-                                    "file_path": str(relative_path),
-                                    "file_name": file,
-                                    "file_size": stat.st_size,
-                                    "encoding": used_encoding,
-                                    "match_count": len(matches_in_file),
-                                    "matches": matches_in_file
-                                })
-                    
-                    except Exception as e:
-                        logging.debug(f"Error searching in file {file_path}: {e}")
-                        continue
+                    pending.append(executor.submit(
+                        self._search_file, entry, root_prefix, keyword,
+                        keyword_bytes, case_sensitive, max_matches_per_file
+                    ))
+                    if len(pending) >= max_workers * 4:
+                        record(pending.popleft().result())
                 
-                if len(results["matches"]) >= max_results:
-                    break
+                while pending and len(results["matches"]) < max_results:
+                    record(pending.popleft().result())
+                
+                for future in pending:
+                    future.cancel()
             
             # Sort results by relevance (number of matches, then by file name)
             results["matches"].sort(key=lambda x: (-x["match_count"], x["file_name"]))
@@ -426,36 +673,246 @@ class UniversalProjectMCP:
         except Exception as e:
             return {"error": f"Search failed: {str(e)}"}
 
-    def _is_likely_binary_file(self, file_path: Path) -> bool:
+    def _search_file(self, entry: os.DirEntry, root_prefix: str, keyword: str,
+                     keyword_bytes: Optional[tuple], case_sensitive: bool,
+                     max_matches: int) -> tuple:
+        """Search one file for search_in_files, returning (searched, file_result)"""
+        file_path = entry.path
+        
+        # Skip binary files and very large files
+        try:
+            stat = entry.stat()
+            if stat.st_size > 10 * 1024 * 1024:  # Skip files larger than 10MB
+                return False, None
+                
+            # Check if file might be binary
+            if self._is_likely_binary_file(file_path, stat, entry.name):
+                return False, None
+                
+        except Exception:
+            return False, None
+        
+        # Search in file content
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            
+            # Case-insensitive matching lowers the decoded text, where non-ASCII
+            # characters can fold to ASCII (U+212A KELVIN SIGN -> 'k'); bytes.lower
+            # only folds ASCII, so that prefilter is exact for ASCII files only
+            if (keyword_bytes is not None and data[:2] not in _UTF16_BOMS
+                    and (case_sensitive or data.isascii())):
+                haystack = data if case_sensitive else data.lower()
+                if not any(form in haystack for form in keyword_bytes):
+                    return True, None
+            
+            content, used_encoding = self._decode_text(data)
+            
+            # Find all matches with line numbers and context
+            matches_in_file = self._find_keyword_matches(
+                content, keyword, case_sensitive, max_matches
+            )
+            
+            if not matches_in_file:
+                return True, None
+            
+            return True, {
+                "file_path": entry.path[len(root_prefix):],
+                "file_name": entry.name,
+                "file_size": stat.st_size,
+                "encoding": used_encoding,
+                "match_count": len(matches_in_file),
+                "matches": matches_in_file
+            }
+        
+        except Exception as e:
+            logging.debug("Error searching in file %s: %s", file_path, e)
+            return True, None
+
+    def _clear_caches(self):
+        """Drop all cached results, e.g. after the project root changes"""
+        self._dependency_cache.clear()
+
+    def _cache_lookup(self, cache: Dict, key: Any, mtime: float) -> Optional[Dict[str, Any]]:
+        """Return a cached result if it was stored for the same mtime"""
+        entry = cache.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        return None
+
+    def _cache_store(self, cache: Dict, key: Any, mtime: float, value: Dict[str, Any]):
+        """Store a result together with the mtime it is valid for"""
+        cache[key] = (mtime, value)
+
+    def _find_all(self, haystack: str, needle: str):
+        """Yield the start of every (possibly overlapping) occurrence of needle"""
+        pos = haystack.find(needle)
+        while pos != -1:
+            yield pos
+            pos = haystack.find(needle, pos + 1)
+
+    def _find_keyword_matches(self, content: str, keyword: str, case_sensitive: bool,
+                              max_matches: int) -> List[Dict[str, Any]]:
+        """Scan content once for keyword matches and map each back to its line"""
+        matches = []
+        keyword_length = len(keyword)
+        
+        if case_sensitive:
+            positions = self._find_all(content, keyword)
+        else:
+            # str.find on a lowered copy is much faster than an IGNORECASE regex;
+            # the regex is only needed when lowering changes string lengths
+            lowered = content.lower()
+            if len(lowered) == len(content):
+                positions = self._find_all(lowered, keyword.lower())
+            else:
+                keyword_regex = re.compile(f"(?=({re.escape(keyword)}))", re.IGNORECASE)
+                positions = (m.start() for m in keyword_regex.finditer(content))
+        
+        # Matches arrive in order, so the line number is tracked by counting the
+        # newlines since the previous match; only matched lines are ever sliced
+        line_number = 1
+        line_start = 0
+        scanned = 0
+        
+        for pos in positions:
+            newlines = content.count('\n', scanned, pos)
+            if newlines:
+                line_number += newlines
+                line_start = content.rfind('\n', scanned, pos) + 1
+            scanned = pos
+            
+            line_end = content.find('\n', line_start)
+            line = content[line_start:line_end if line_end != -1 else len(content)]
+            column = pos - line_start
+            
+            # Get context around the match
+            context_start = max(0, column - 50)
+            context_end = min(len(line), column + keyword_length + 50)
+            
+            matches.append({
+                "line_number": line_number,
+                "column": column + 1,
+                "line_content": line.strip(),
+                "context": line[context_start:context_end],
+                "matched_text": content[pos:pos + keyword_length]
+            })
+            
+            if len(matches) >= max_matches:
+                break
+        
+        return matches
+
+    def _scan_content_lines(self, file_path: str, keyword: str,
+                            keyword_bytes: Optional[bytes]) -> Optional[List[Dict[str, Any]]]:
+        """Return the lines of a file matching keyword for search_files, or None if it doesn't occur"""
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            # Pure-ASCII files can be ruled out without decoding them
+            if keyword_bytes is not None and data.isascii() and keyword_bytes not in data.lower():
+                return None
+            
+            content = data.decode('utf-8', errors='ignore')
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            lowered = content.lower()
+            if keyword not in lowered:
+                return None
+            return self._find_matching_lines(content, lowered, keyword, 5)  # Limit matches per file
+        except Exception:
+            return None  # Skip files that can't be read
+
+    def _find_matching_lines(self, content: str, lowered: str, keyword: str,
+                             max_lines: int) -> List[Dict[str, Any]]:
+        """Return the first lines whose lowercased text contains keyword, for search_files"""
+        matches = []
+        
+        if not keyword or '\n' in keyword or len(lowered) != len(content):
+            # Empty keywords match every line; length-changing case folds need per-line lowering
+            for i, line in enumerate(content.split('\n'), 1):
+                if keyword in line.lower():
+                    matches.append({"line_number": i, "content": line.strip()})
+                    if len(matches) >= max_lines:
+                        break
+            return matches
+        
+        # Jump from match to match, counting newlines only up to each matched line
+        line_number = 1
+        scanned = 0
+        pos = lowered.find(keyword)
+        while pos != -1:
+            line_number += content.count('\n', scanned, pos)
+            line_start = content.rfind('\n', 0, pos) + 1
+            line_end = content.find('\n', pos)
+            if line_end == -1:
+                line_end = len(content)
+            matches.append({"line_number": line_number, "content": content[line_start:line_end].strip()})
+            if len(matches) >= max_lines:
+                break
+            scanned = line_end
+            pos = lowered.find(keyword, line_end + 1)
+        
+        return matches
+
+    def _normalize_extensions(self, file_extensions: Optional[List[str]]) -> set:
+        """Lowercase extensions and ensure each has a leading dot"""
+        if not file_extensions:
+            return set()
+        return {ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in file_extensions}
+
+    def _scantree(self, root: Union[str, Path], skip_dirs: frozenset, max_depth: Optional[int] = None):
+        """Yield DirEntry objects for all files under root, breadth-first, down to max_depth levels"""
+        pending = deque([(str(root), 0)])
+        executor = None
+        
+        try:
+            while pending:
+                # Queued directories are independent, so up to 8 are listed concurrently;
+                # results are consumed in queue order, keeping the yield order unchanged
+                batch = [pending.popleft() for _ in range(min(8, len(pending)))]
+                if len(batch) == 1:
+                    listings = [_scandir_entries(batch[0][0])]
+                else:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(max_workers=8)
+                    listings = list(executor.map(_scandir_entries, [current for current, _ in batch]))
+                
+                for (current, depth), entries in zip(batch, listings):
+                    if entries is None:
+                        continue  # Unreadable directory, same as os.walk
+                    descend = max_depth is None or depth < max_depth
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if descend and entry.name not in skip_dirs:
+                                    pending.append((entry.path, depth + 1))
+                            elif entry.is_file():
+                                yield entry
+                        except OSError:
+                            continue
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _is_likely_binary_file(self, file_path: str, stat: Optional[os.stat_result] = None,
+                               name: Optional[str] = None) -> bool:
         """Check if file is likely binary by extension and content sampling"""
         # Check extension first
-        binary_extensions = {
-            '.exe', '.dll', '.so', '.dylib', '.bin', '.dat', '.db', '.sqlite',
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.webp',
-            '.mp3', '.mp4', '.avi', '.mov', '.wav', '.flac', '.ogg',
-            '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-            '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2',
-            '.woff', '.woff2', '.ttf', '.otf', '.eot'
-        }
-        
-        if file_path.suffix.lower() in binary_extensions:
+        suffix = _file_suffix(name or os.path.basename(file_path)).lower()
+        if suffix in _BINARY_EXTENSIONS:
             return True
+        if suffix in _TEXT_EXTENSIONS:
+            return False
         
-        # Sample first few bytes to check for binary content
+        # Sample first few bytes, reusing the verdict while the file is unchanged
         try:
-            with open(file_path, 'rb') as f:
-                sample = f.read(512)
-                # Check for null bytes (common in binary files)
-                if b'\x00' in sample:
-                    return True
-                # Check for high ratio of non-printable characters
-                printable_chars = sum(1 for byte in sample if 32 <= byte < 127 or byte in [9, 10, 13])
-                if len(sample) > 0 and printable_chars / len(sample) < 0.7:
-                    return True
+            if stat is None:
+                stat = os.stat(file_path)
         except Exception:
             return True
         
-        return False
+        return _sniff_binary(file_path, stat.st_mtime, stat.st_size)
 
 
     def list_directory(self, path: str = "") -> Dict[str, Any]:
@@ -463,37 +920,48 @@ class UniversalProjectMCP:
         try:
             target_path = self.project_root / path if path else self.project_root
             
-            if not target_path.exists():
+            # One stat answers both existence and type
+            try:
+                dir_stat = target_path.stat()
+            except _MISSING_PATH_ERRORS:
                 return {"error": f"Directory not found: {path}"}
             
-            if not target_path.is_dir():
+            if not S_ISDIR(dir_stat.st_mode):
                 return {"error": f"Path is not a directory: {path}"}
             
-            items = []
+            # (is file, lowercased name, position, item): directories first, then files
+            keyed_items = []
+            
+            # DirEntry caches the dirent type and stat result, so each entry costs one stat
+            with os.scandir(target_path) as it:
+                entries = list(it)
             
-            for item in target_path.iterdir():
+            for entry in entries:
                 try:
-                    stat = item.stat()
+                    stat = entry.stat()
+                    is_file = entry.is_file()
+                    is_dir = entry.is_dir()
                     item_info = {
-                        "name": item.name,
-                        "type": "directory" if item.is_dir() else "file",
-                        "size": stat.st_size if item.is_file() else None,
+                        "name": entry.name,
+                        "type": "directory" if is_dir else "file",
+                        "size": stat.st_size if is_file else None,
                         "modified": stat.st_mtime,
                     }
                     
-                    if item.is_file():
-                        item_info["extension"] = item.suffix
+                    if is_file:
+                        item_info["extension"] = _file_suffix(entry.name)
                         # Get MIME type
-                        mime_type, _ = mimetypes.guess_type(str(item))
+                        mime_type, _ = _guess_type(entry.name)
                         item_info["mime_type"] = mime_type
                     
-                    items.append(item_info)
+                    keyed_items.append((not is_dir, entry.name.lower(), len(keyed_items), item_info))
                     
                 except Exception:
                     continue
             
-            # Sort: directories first, then files
-            items.sort(key=lambda x: (x['type'] == 'file', x['name'].lower()))
+            # Sort the precomputed keys; the position breaks ties so items are never compared
+            keyed_items.sort()
+            items = [item for _, _, _, item in keyed_items]
             
             return {
                 "path": path,
@@ -510,11 +978,14 @@ class UniversalProjectMCP:
         try:
             full_path = self.project_root / file_path
             
-            if not full_path.exists():
+            # One stat answers existence, type, size and times
+            try:
+                stat = full_path.stat()
+            except _MISSING_PATH_ERRORS:
                 return {"error": f"File not found: {file_path}"}
             
-            stat = full_path.stat()
-            mime_type, encoding = mimetypes.guess_type(str(full_path))
+            is_file = S_ISREG(stat.st_mode)
+            mime_type, encoding = _guess_type(full_path.name)
             
             info = {
                 "path": file_path,
@@ -524,23 +995,23 @@ class UniversalProjectMCP:
                 "extension": full_path.suffix,
                 "mime_type": mime_type,
                 "encoding": encoding,
-                "is_directory": full_path.is_dir(),
-                "is_file": full_path.is_file(),
+                "is_directory": S_ISDIR(stat.st_mode),
+                "is_file": is_file,
                 "modified": stat.st_mtime,
                 "created": stat.st_ctime,
             }
             
             # For text files, get additional info
-            if full_path.is_file() and stat.st_size < 1024 * 1024:  # Max 1MB
+            if is_file and stat.st_size < 1024 * 1024:  # Max 1MB
                 try:
                     with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
                         content = f.read()
-                        lines = content.split('\n')
+                        # Count in C instead of splitting into a list of lines
                         info.update({
-                            "lines": len(lines),
+                            "lines": content.count('\n') + 1,
                             "characters": len(content),
                             "words": len(content.split()),
-                            "blank_lines": sum(1 for line in lines if not line.strip())
+                            "blank_lines": len(_BLANK_LINE_RE.findall(content))
                         })
                 except:
                     pass
@@ -563,20 +1034,18 @@ class UniversalProjectMCP:
             # Detect project type
             summary["project_type"] = self._detect_project_type()
             
-            # Find README files
-            summary["readme_files"] = self._find_readme_files()
-            
-            # Count files by extension
-            summary["file_statistics"] = self._count_files_by_extension()
+            # README files, extension counts and size all come from one walk
+            stats = self._collect_stats()
+            summary["readme_files"] = stats["readme_files"]
+            summary["file_statistics"] = stats["file_statistics"]
             
             # Find main directories
             summary["main_directories"] = self._get_main_directories()
             
-            # Calculate total project size
-            summary["total_size_mb"] = self._calculate_project_size()
+            summary["total_size_mb"] = round(stats["total_size"] / (1024 * 1024), 2)  # Convert to MB
             
             # Estimate complexity
-            summary["estimated_complexity"] = self._estimate_complexity()
+            summary["estimated_complexity"] = self._estimate_complexity(stats["total_files"])
             
             return summary
             
@@ -606,17 +1075,37 @@ class UniversalProjectMCP:
                 "build.gradle": self._parse_gradle
             }
             
+            # Reuse parsed results while the files are unchanged; the rest are parsed below
+            results = {}
+            pending = []
             for filename, parser in dep_files.items():
                 file_path = self.project_root / filename
-                if file_path.exists():
+                try:
+                    file_mtime = file_path.stat().st_mtime_ns
+                except OSError:
+                    continue
+                results[filename] = self._cache_lookup(self._dependency_cache, str(file_path), file_mtime)
+                if results[filename] is None:
+                    pending.append((filename, parser, file_path, file_mtime))
+            
+            # Parsing is mostly file reads, so several files are handled concurrently
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+                    futures = [(filename, file_path, file_mtime, executor.submit(parser, file_path))
+                               for filename, parser, file_path, file_mtime in pending]
+                for filename, file_path, file_mtime, future in futures:
                     try:
-                        parsed = parser(file_path)
-                        if parsed:
-                            dependencies["dependency_files"][filename] = parsed
-                            dependencies["total_dependencies"] += len(parsed.get("dependencies", {}))
-                            dependencies["dev_dependencies"] += len(parsed.get("dev_dependencies", {}))
+                        results[filename] = future.result()
                     except Exception as e:
-                        dependencies["dependency_files"][filename] = {"error": str(e)}
+                        results[filename] = {"error": str(e)}
+                    else:
+                        self._cache_store(self._dependency_cache, str(file_path), file_mtime, results[filename])
+            
+            for filename, parsed in results.items():
+                if parsed:
+                    dependencies["dependency_files"][filename] = parsed
+                    dependencies["total_dependencies"] += len(parsed.get("dependencies", {}))
+                    dependencies["dev_dependencies"] += len(parsed.get("dev_dependencies", {}))
             
             # Create summary
             for filename, data in dependencies["dependency_files"].items():
@@ -638,46 +1127,38 @@ class UniversalProjectMCP:
     def find_entry_points(self) -> List[Dict[str, Any]]:
         """Find main entry points and important files of the application"""
         try:
-            entry_points = []
-            
-            # Entry point patterns for different project types
-            patterns = {
-                "main_files": ["main.*", "index.*", "app.*", "server.*", "run.*"],
-                "config_files": ["*.config.*", "config.*", "settings.*", ".env*"],
-                "route_files": ["routes.*", "urls.py", "router.*", "api.*"],
-                "build_files": ["Dockerfile", "docker-compose.*", "Makefile", "build.*"],
-                "test_files": ["test.*", "*test.*", "spec.*", "*spec.*"]
-            }
+            candidates = []
+            root_prefix = os.path.join(str(self.project_root), "")
             
-            for category, file_patterns in patterns.items():
-                for pattern in file_patterns:
-                    matches = self.search_files(pattern=pattern, max_results=20)
-                    
-                    for match in matches:
-                        if isinstance(match, dict) and "error" not in match:
-                            entry_points.append({
-                                "file": match["path"],
-                                "name": match["name"],
-                                "category": category,
-                                "type": self._classify_entry_point(match["name"]),
-                                "size": match["size"],
-                                "directory": match["directory"]
-                            })
-            
-            # Remove duplicates and sort by importance
-            seen = set()
-            unique_points = []
-            for point in entry_points:
-                key = point["file"]
-                if key not in seen:
-                    seen.add(key)
-                    unique_points.append(point)
-            
-            # Sort by category importance and file name
-            category_order = {"main_files": 1, "config_files": 2, "route_files": 3, "build_files": 4, "test_files": 5}
-            unique_points.sort(key=lambda x: (category_order.get(x["category"], 6), x["name"]))
-            
-            return unique_points[:50]  # Limit results
+            for entry in self._scantree(self.project_root, _SKIP_DIRS):
+                name_lower = entry.name.lower()
+                
+                # A file belongs to the first (most important) category it matches
+                for rank, (category, regex) in enumerate(_ENTRY_POINT_REGEXES):
+                    if regex.match(name_lower):
+                        try:
+                            size = entry.stat().st_size
+                        except OSError:
+                            break
+                        
+                        relative_path = entry.path[len(root_prefix):]
+                        directory = os.path.dirname(relative_path) or "."
+                        # Tuples sort by category importance, file name and directory
+                        candidates.append((rank, entry.name, directory, relative_path, category, size))
+                        break
+            
+            # Only the first 50 are returned, so select them without sorting everything
+            return [
+                {
+                    "file": relative_path,
+                    "name": name,
+                    "category": category,
+                    "type": self._classify_entry_point(name),
+                    "size": size,
+                    "directory": directory
+                }
+                for _, name, directory, relative_path, category, size in heapq.nsmallest(50, candidates)
+            ]
             
         except Exception as e:
             return [{"error": f"Error finding entry points: {str(e)}"}]
@@ -704,127 +1185,156 @@ class UniversalProjectMCP:
             ("PHP", ["composer.json", "*.php"]),
         ]
         
+        # One listing of the root answers every plain-name indicator
+        root_names = set()
+        try:
+            with os.scandir(self.project_root) as it:
+                for entry in it:
+                    # Dangling symlinks don't count, matching Path.exists()
+                    if not entry.is_symlink() or os.path.exists(entry.path):
+                        root_names.add(entry.name)
+        except OSError:
+            pass
+        
+        # Wildcard indicators need a recursive walk; do it at most once, for all of them
+        wildcard_suffixes = {indicator[1:].lower() for _, files in indicators
+                             for indicator in files if "*" in indicator}
+        found_suffixes = None
+        
         for project_type, files in indicators:
             score = 0
-            for indicator in files:
+            for i, indicator in enumerate(files):
+                # Give up once the indicators left can't reach 2, skipping their walks
+                if score + len(files) - i < 2:
+                    break
                 if "*" in indicator:
                     # Wildcard pattern
-                    matches = self.search_files(pattern=indicator, max_results=1)
-                    if matches and not any("error" in m for m in matches if isinstance(m, dict)):
+                    if found_suffixes is None:
+                        found_suffixes = self._find_suffixes(wildcard_suffixes)
+                    if indicator[1:].lower() in found_suffixes:
                         score += 1
-                else:
-                    # Exact file/directory
+                elif "/" in indicator:
+                    # Nested path
                     if (self.project_root / indicator).exists():
                         score += 1
-            
-            if score >= 2:  # Need at least 2 indicators
-                return project_type
+                else:
+                    # Exact file/directory in the root
+                    if indicator in root_names:
+                        score += 1
+                
+                if score >= 2:  # Need at least 2 indicators
+                    return project_type
         
         return "Unknown"
     
-    def _find_readme_files(self) -> List[Dict[str, str]]:
-        """Find README files in the project"""
-        readme_patterns = ["README*", "readme*", "Read*"]
-        readme_files = []
-        
-        for pattern in readme_patterns:
-            matches = self.search_files(pattern=pattern, max_results=10)
-            for match in matches:
-                if isinstance(match, dict) and "error" not in match:
-                    readme_files.append({
-                        "path": match["path"],
-                        "name": match["name"],
-                        "size": match["size"]
-                    })
-        
-        # Remove duplicates
-        seen = set()
-        unique_readmes = []
-        for readme in readme_files:
-            if readme["path"] not in seen:
-                seen.add(readme["path"])
-                unique_readmes.append(readme)
-        
-        return unique_readmes
+    def _find_suffixes(self, suffixes: set) -> set:
+        """Walk the project until a file ending in each suffix is found, returning those seen"""
+        found = set()
+        try:
+            for entry in self._scantree(self.project_root, _SKIP_DIRS):
+                name = entry.name.lower()
+                for suffix in suffixes - found:
+                    if name.endswith(suffix):
+                        found.add(suffix)
+                if len(found) == len(suffixes):
+                    break
+        except Exception:
+            pass
+        return found
     
-    def _count_files_by_extension(self) -> Dict[str, int]:
-        """Count files by their extensions"""
-        extension_counts = {}
+    def _collect_stats(self) -> Dict[str, Any]:
+        """Walk the project once, collecting README files, extension counts, file count and total size"""
+        root_prefix = os.path.join(str(self.project_root), "")
+        extension_counts = defaultdict(int)
+        total_files = 0
+        total_size = 0
+        readmes = []
+        other_read_files = []
         
         try:
-            for root, dirs, files in os.walk(self.project_root):
-                # Skip build/cache directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '.git', 'node_modules', '__pycache__', '.venv', 'venv',
-                    'target', 'build', 'dist', '.cache', 'tmp', 'temp'
-                }]
+            for entry in self._scantree(self.project_root, _SKIP_DIRS):
+                name = entry.name
+                ext = _file_suffix(name).lower()
+                if not ext:
+                    ext = "no_extension"
+                extension_counts[ext] += 1
+                total_files += 1
                 
-                for file in files:
-                    ext = Path(file).suffix.lower()
-                    if not ext:
-                        ext = "no_extension"
-                    extension_counts[ext] = extension_counts.get(ext, 0) + 1
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                total_size += size
+                
+                # README*, plus other Read* files such as READ_ME or ReadMe variants
+                name_lower = name.lower()
+                if name_lower.startswith('read'):
+                    readme = {
+                        "path": entry.path[len(root_prefix):],
+                        "name": name,
+                        "size": size
+                    }
+                    if name_lower.startswith('readme'):
+                        readmes.append(readme)
+                    else:
+                        other_read_files.append(readme)
         except Exception:
             pass
         
-        # Sort by count
-        return dict(sorted(extension_counts.items(), key=lambda x: x[1], reverse=True))
+        # README files first, each group ordered by location and capped at 10
+        readme_files = []
+        for group in (readmes, other_read_files):
+            group.sort(key=lambda x: (os.path.dirname(x["path"]), x["name"]))
+            readme_files.extend(group[:10])
+        
+        return {
+            "readme_files": readme_files,
+            # Sort by count
+            "file_statistics": dict(sorted(extension_counts.items(), key=itemgetter(1), reverse=True)),
+            "total_files": total_files,
+            "total_size": total_size
+        }
     
     def _get_main_directories(self) -> List[Dict[str, Any]]:
         """Get main directories in project root"""
         directories = []
         
         try:
-            for item in self.project_root.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    # Count files in directory
-                    file_count = 0
-                    try:
-                        for _ in item.rglob('*'):
-                            file_count += 1
-                            if file_count > 1000:  # Limit counting for performance
-                                break
-                    except:
-                        file_count = 0
-                    
-                    directories.append({
-                        "name": item.name,
-                        "file_count": file_count,
-                        "type": self._classify_directory(item.name)
-                    })
+            with os.scandir(self.project_root) as it:
+                for entry in it:
+                    if entry.is_dir() and not entry.name.startswith('.'):
+                        directories.append({
+                            "name": entry.name,
+                            # Limit counting for performance
+                            "file_count": self._count_entries(entry.path, 1000),
+                            "type": self._classify_directory(entry.name)
+                        })
         except Exception:
             pass
         
         return sorted(directories, key=lambda x: x["file_count"], reverse=True)
     
-    def _calculate_project_size(self) -> float:
-        """Calculate total project size in MB"""
-        total_size = 0
-        
-        try:
-            for root, dirs, files in os.walk(self.project_root):
-                # Skip build/cache directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '.git', 'node_modules', '__pycache__', '.venv', 'venv',
-                    'target', 'build', 'dist', '.cache', 'tmp', 'temp'
-                }]
-                
-                for file in files:
-                    try:
-                        file_path = Path(root) / file
-                        total_size += file_path.stat().st_size
-                    except:
-                        continue
-        except Exception:
-            pass
-        
-        return round(total_size / (1024 * 1024), 2)  # Convert to MB
+    def _count_entries(self, path: str, limit: int) -> int:
+        """Count everything below path, stopping once the count exceeds limit"""
+        count = 0
+        pending = [path]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        count += 1
+                        if count > limit:
+                            return count
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+            except PermissionError:
+                continue  # Skipped, as rglob does
+            except OSError:
+                return 0
+        return count
     
-    def _estimate_complexity(self) -> str:
+    def _estimate_complexity(self, total_files: int) -> str:
         """Estimate project complexity based on file counts and structure"""
-        file_stats = self._count_files_by_extension()
-        total_files = sum(file_stats.values())
-        
         if total_files < 10:
             return "Very Simple"
         elif total_files < 50:
@@ -838,39 +1348,16 @@ class UniversalProjectMCP:
     
     def _classify_directory(self, dir_name: str) -> str:
         """Classify directory type"""
-        classifications = {
-            "source": ["src", "lib", "app", "source"],
-            "config": ["config", "configs", "settings", "conf"],
-            "assets": ["assets", "static", "public", "resources", "images", "img"],
-            "tests": ["test", "tests", "spec", "specs", "__tests__"],
-            "docs": ["docs", "documentation", "doc"],
-            "build": ["build", "dist", "out", "target", "bin"],
-            "dependencies": ["node_modules", "vendor", "packages"],
-        }
-        
         dir_lower = dir_name.lower()
-        for category, keywords in classifications.items():
-            if any(keyword in dir_lower for keyword in keywords):
-                return category
-        
-        return "other"
+        # Most directories are named exactly after a keyword
+        category = _DIRECTORY_CLASS_BY_NAME.get(dir_lower)
+        if category is None:
+            category = _classify_name(dir_lower, _DIRECTORY_CLASSES)
+        return category
     
     def _classify_entry_point(self, filename: str) -> str:
         """Classify entry point file type"""
-        name_lower = filename.lower()
-        
-        if any(x in name_lower for x in ["main", "index", "app"]):
-            return "main_entry"
-        elif any(x in name_lower for x in ["config", "settings"]):
-            return "configuration"
-        elif any(x in name_lower for x in ["route", "url", "api"]):
-            return "routing"
-        elif any(x in name_lower for x in ["test", "spec"]):
-            return "testing"
-        elif any(x in name_lower for x in ["docker", "make", "build"]):
-            return "build_system"
-        else:
-            return "other"
+        return _classify_name(filename.lower(), _ENTRY_POINT_TYPES)
     
     def _get_dependency_file_type(self, filename: str) -> str:
         """Get the type of dependency file"""
@@ -908,35 +1395,34 @@ class UniversalProjectMCP:
     def _parse_pubspec_yaml(self, file_path: Path) -> Dict[str, Any]:
         """Parse pubspec.yaml file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Simple YAML parsing for dependencies
+            # Simple YAML parsing for dependencies: direct children of the two sections
             dependencies = {}
             dev_dependencies = {}
-            in_deps = False
-            in_dev_deps = False
-            
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('dependencies:'):
-                    in_deps = True
-                    in_dev_deps = False
-                elif line.startswith('dev_dependencies:'):
-                    in_deps = False
-                    in_dev_deps = True
-                elif line and not line.startswith(' ') and ':' in line:
-                    in_deps = False
-                    in_dev_deps = False
-                elif line.startswith('  ') and ':' in line and (in_deps or in_dev_deps):
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        dep_name = parts[0].strip()
-                        dep_version = parts[1].strip()
-                        if in_deps:
-                            dependencies[dep_name] = dep_version
-                        elif in_dev_deps:
-                            dev_dependencies[dep_name] = dep_version
+            section = None
+            child_indent = None
+            
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for raw_line in f:
+                    line = raw_line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    
+                    indent = len(raw_line) - len(raw_line.lstrip())
+                    if indent == 0:
+                        # A top-level key opens or closes a section
+                        if line.startswith('dependencies:'):
+                            section = dependencies
+                        elif line.startswith('dev_dependencies:'):
+                            section = dev_dependencies
+                        else:
+                            section = None
+                        child_indent = None
+                    elif section is not None and ':' in line:
+                        if child_indent is None:
+                            child_indent = indent
+                        if indent == child_indent:
+                            dep_name, _, dep_version = line.partition(':')
+                            section[dep_name.strip()] = dep_version.strip().strip('"\'')
             
             return {
                 "dependencies": dependencies,
@@ -948,21 +1434,17 @@ class UniversalProjectMCP:
     def _parse_requirements_txt(self, file_path: Path) -> Dict[str, Any]:
         """Parse requirements.txt file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
             dependencies = {}
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Split by various version specifiers
-                    for sep in ['==', '>=', '<=', '>', '<', '~=', '!=']:
-                        if sep in line:
-                            parts = line.split(sep)
-                            dependencies[parts[0].strip()] = f"{sep}{parts[1].strip()}"
-                            break
-                    else:
-                        dependencies[line] = ""
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        # Split at the first version specifier
+                        match = _VERSION_SPECIFIER_RE.search(line)
+                        if match:
+                            dependencies[line[:match.start()].strip()] = match.group() + line[match.end():].strip()
+                        else:
+                            dependencies[line] = ""
             
             return {
                 "dependencies": dependencies,
@@ -974,40 +1456,16 @@ class UniversalProjectMCP:
     def _parse_pipfile(self, file_path: Path) -> Dict[str, Any]:
         """Parse Pipfile"""
         try:
-            # Simple Pipfile parsing
-            dependencies = {}
-            dev_dependencies = {}
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Imported here: only dependency parsing needs TOML, so server startup skips it
+            import tomllib
             
-            in_packages = False
-            in_dev_packages = False
-            
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('[packages]'):
-                    in_packages = True
-                    in_dev_packages = False
-                elif line.startswith('[dev-packages]'):
-                    in_packages = False
-                    in_dev_packages = True
-                elif line.startswith('[') and line.endswith(']'):
-                    in_packages = False
-                    in_dev_packages = False
-                elif '=' in line and (in_packages or in_dev_packages):
-                    parts = line.split('=', 1)
-                    if len(parts) == 2:
-                        dep_name = parts[0].strip()
-                        dep_version = parts[1].strip().strip('"\'')
-                        if in_packages:
-                            dependencies[dep_name] = dep_version
-                        elif in_dev_packages:
-                            dev_dependencies[dep_name] = dep_version
+            # Pipfile is TOML
+            with open(file_path, 'rb') as f:
+                data = tomllib.load(f)
             
             return {
-                "dependencies": dependencies,
-                "dev_dependencies": dev_dependencies
+                "dependencies": data.get("packages", {}),
+                "dev_dependencies": data.get("dev-packages", {})
             }
         except Exception:
             return {"error": "Failed to parse Pipfile"}
@@ -1034,24 +1492,14 @@ class UniversalProjectMCP:
                 content = f.read()
             
             dependencies = {}
-            in_require = False
             
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('require'):
-                    if '(' in line:
-                        in_require = True
-                    else:
-                        # Single line require
-                        parts = line.replace('require', '').strip().split()
-                        if len(parts) >= 2:
-                            dependencies[parts[0]] = parts[1]
-                elif in_require and line == ')':
-                    in_require = False
-                elif in_require and line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        dependencies[parts[0]] = parts[1]
+            # require blocks and single-line requires, in file order
+            for match in _GO_REQUIRE_RE.finditer(content):
+                if match.group('block') is not None:
+                    for module, version in _GO_MODULE_LINE_RE.findall(match.group('block')):
+                        dependencies[module] = version
+                else:
+                    dependencies[match.group('module')] = match.group('version')
             
             return {
                 "dependencies": dependencies,
@@ -1063,65 +1511,36 @@ class UniversalProjectMCP:
     def _parse_cargo_toml(self, file_path: Path) -> Dict[str, Any]:
         """Parse Cargo.toml file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            import tomllib
             
-            dependencies = {}
-            dev_dependencies = {}
-            in_deps = False
-            in_dev_deps = False
-            
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('[dependencies]'):
-                    in_deps = True
-                    in_dev_deps = False
-                elif line.startswith('[dev-dependencies]'):
-                    in_deps = False
-                    in_dev_deps = True
-                elif line.startswith('[') and line.endswith(']'):
-                    in_deps = False
-                    in_dev_deps = False
-                elif '=' in line and (in_deps or in_dev_deps):
-                    parts = line.split('=', 1)
-                    if len(parts) == 2:
-                        dep_name = parts[0].strip()
-                        dep_version = parts[1].strip().strip('"\'')
-                        if in_deps:
-                            dependencies[dep_name] = dep_version
-                        elif in_dev_deps:
-                            dev_dependencies[dep_name] = dep_version
+            with open(file_path, 'rb') as f:
+                data = tomllib.load(f)
             
             return {
-                "dependencies": dependencies,
-                "dev_dependencies": dev_dependencies
+                "dependencies": data.get("dependencies", {}),
+                "dev_dependencies": data.get("dev-dependencies", {})
             }
         except Exception:
             return {"error": "Failed to parse Cargo.toml"}
     
     def _parse_pom_xml(self, file_path: Path) -> Dict[str, Any]:
-        """Parse pom.xml file (basic parsing)"""
+        """Parse pom.xml file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Imported here, like tomllib: only pom.xml parsing needs it
+            import xml.etree.ElementTree as ET
             
             dependencies = {}
-            # Very basic XML parsing for dependencies
-            import re
-            
-            # Find dependency blocks
-            dep_pattern = r'<dependency>.*?</dependency>'
-            matches = re.findall(dep_pattern, content, re.DOTALL)
             
-            for match in matches:
-                group_match = re.search(r'<groupId>(.*?)</groupId>', match)
-                artifact_match = re.search(r'<artifactId>(.*?)</artifactId>', match)
-                version_match = re.search(r'<version>(.*?)</version>', match)
-                
-                if group_match and artifact_match:
-                    dep_name = f"{group_match.group(1)}:{artifact_match.group(1)}"
-                    version = version_match.group(1) if version_match else ""
-                    dependencies[dep_name] = version
+            # Stream the document, dropping each dependency element once read
+            for _, elem in ET.iterparse(file_path, events=('end',)):
+                if elem.tag.rpartition('}')[2] != 'dependency':
+                    continue
+                group_id = elem.findtext('{*}groupId')
+                artifact_id = elem.findtext('{*}artifactId')
+                if group_id is not None and artifact_id is not None:
+                    dep_name = f"{group_id.strip()}:{artifact_id.strip()}"
+                    dependencies[dep_name] = (elem.findtext('{*}version') or "").strip()
+                elem.clear()
             
             return {
                 "dependencies": dependencies,
@@ -1139,23 +1558,12 @@ class UniversalProjectMCP:
             dependencies = {}
             dev_dependencies = {}
             
-            # Look for implementation/compile dependencies
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if any(line.startswith(dep_type) for dep_type in ['implementation', 'compile', 'api']):
-                    # Extract dependency string
-                    import re
-                    match = re.search(r'["\']([^"\']+)["\']', line)
-                    if match:
-                        dep_string = match.group(1)
-                        dependencies[dep_string] = ""
-                elif any(line.startswith(dep_type) for dep_type in ['testImplementation', 'androidTestImplementation']):
-                    import re
-                    match = re.search(r'["\']([^"\']+)["\']', line)
-                    if match:
-                        dep_string = match.group(1)
-                        dev_dependencies[dep_string] = ""
+            # Look for implementation/compile dependencies, one scan over the whole file
+            for match in _GRADLE_DEPENDENCY_RE.finditer(content):
+                if match.group('kind') in ('testImplementation', 'androidTestImplementation'):
+                    dev_dependencies[match.group('dependency')] = ""
+                else:
+                    dependencies[match.group('dependency')] = ""
             
             return {
                 "dependencies": dependencies,
@@ -1165,230 +1573,246 @@ class UniversalProjectMCP:
             return {"error": "Failed to parse build.gradle"}
 
 
+# Tool schemas returned by tools/list
+_TOOLS = [
+    {
+        "name": "set_project_path",
+        "description": "Set the project root path and save it for future use",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Absolute or relative path to project directory"}
+            },
+            "required": ["path"]
+        }
+    },
+    {
+        "name": "get_project_path",
+        "description": "Get the current project root path",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    {
+        "name": "get_structure",
+        "description": "Get project directory structure with configurable depth",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Path relative to project root"},
+                "max_depth": {"type": "integer", "description": "Maximum depth to traverse", "default": 2}
+            }
+        }
+    },
+    {
+        "name": "read_file",
+        "description": "Read file content with optional line range",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "file_path": {"type": "string", "description": "Path to file relative to project root"},
+                "start_line": {"type": "integer", "description": "Start line number", "default": 1},
+                "end_line": {"type": "integer", "description": "End line number"}
+            },
+            "required": ["file_path"]
+        }
+    },
+    {
+        "name": "search_files",
+        "description": "Search for files by pattern and optionally in content",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "File name pattern (supports wildcards)", "default": "*"},
+                "path": {"type": "string", "description": "Path to search in"},
+                "include_content": {"type": "boolean", "description": "Search within file content", "default": False},
+                "file_extensions": {"type": "array", "items": {"type": "string"}, "description": "Filter by file extensions"},
+                "max_results": {"type": "integer", "description": "Maximum results to return", "default": 100},
+                "max_depth": {"type": "integer", "description": "Maximum directory depth below the search path (0 = only that directory); unlimited if omitted"}
+            }
+        }
+    },
+    {
+        "name": "list_directory",
+        "description": "List directory contents (flat view)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Directory path relative to project root"}
+            }
+        }
+    },
+    {
+        "name": "get_file_info",
+        "description": "Get detailed file information",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "file_path": {"type": "string", "description": "Path to file relative to project root"}
+            },
+            "required": ["file_path"]
+        }
+    },
+    {
+        "name": "get_project_summary",
+        "description": "Get comprehensive project overview and analysis",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    {
+        "name": "get_dependencies",
+        "description": "Extract and analyze project dependencies from various config files",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    {
+        "name": "find_entry_points",
+        "description": "Find main entry points and important files of the application",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    {
+        "name": "search_in_files", 
+        "description": "Search for keyword within file contents and return matching files with context",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "keyword": {"type": "string", "description": "Keyword to search for"},
+                "path": {"type": "string", "description": "Path to search in (relative to project root)"},
+                "file_extensions": {"type": "array", "items": {"type": "string"}, "description": "Filter by file extensions (e.g. ['.py', '.js'])"},
+                "max_results": {"type": "integer", "description": "Maximum number of files to return", "default": 50},
+                "case_sensitive": {"type": "boolean", "description": "Whether search should be case sensitive", "default": False},
+                "max_matches_per_file": {"type": "integer", "description": "Maximum matches to show per file", "default": 10}
+            },
+            "required": ["keyword"]
+        }
+    }
+]
+
+# The initialize and tools/list results never change, so they are serialized once
+_INITIALIZE_RESULT_JSON = json.dumps({
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "universal-project-mcp",
+        "version": "2.0.0"
+    }
+})
+_TOOLS_LIST_RESULT_JSON = json.dumps({"tools": _TOOLS})
+
+
+def _handle_request(mcp: UniversalProjectMCP, request: Any) -> str:
+    """Dispatch one JSON-RPC request and return its serialized response"""
+    try:
+        method = request.get("method")
+        params = request.get("params", {})
+        request_id = request.get("id")
+    
+        logging.info("Processing method: %s", method)
+    
+        # Handle MCP protocol methods; result_json is set instead of result when pre-serialized
+        result_json = None
+        if method == "initialize":
+            result_json = _INITIALIZE_RESULT_JSON
+        elif method == "initialized":
+            result = {}
+        elif method == "tools/list":
+            result_json = _TOOLS_LIST_RESULT_JSON
+        elif method == "tools/call":
+            tool_name = params.get("name")
+            arguments = params.get("arguments", {})
+        
+            # Route to methods
+            handler = mcp._dispatch.get(tool_name)
+            if handler is not None:
+                tool_result = handler(**arguments)
+            else:
+                tool_result = {"error": f"Unknown tool: {tool_name}"}
+            
+            # Format result for MCP
+            result = {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": json.dumps(tool_result, indent=2)
+                    }
+                ]
+            }
+        else:
+            result = {"error": f"Unknown method: {method}"}
+    
+        # Splice in the serialized result (same text as dumping the whole dict)
+        if result_json is None:
+            result_json = json.dumps(result)
+        return f'{{"jsonrpc": "2.0", "id": {json.dumps(request_id)}, "result": {result_json}}}'
+    except Exception as e:
+        logging.error("Error processing request: %s", e)
+        error_response = {
+            "jsonrpc": "2.0",
+            "id": request.get("id") if isinstance(request, dict) else None,
+            "error": {"code": -1, "message": str(e)}
+        }
+        return json.dumps(error_response)
+
+
 def main():
     logging.info("Universal Project MCP Server starting...")
     mcp = UniversalProjectMCP()
+    # Read raw bytes: json.loads detects the UTF encoding itself, so the text layer is skipped
+    stdin = sys.stdin.buffer
     
     while True:
         try:
-            line = sys.stdin.readline()
+            line = stdin.readline()
             if not line:
                 logging.info("No input received, exiting")
                 break
                 
-            logging.debug(f"Received: {line.strip()}")
-            request = json.loads(line.strip())
-            
-            method = request.get("method")
-            params = request.get("params", {})
-            request_id = request.get("id")
-            
-            logging.info(f"Processing method: {method}")
-            
-            # Handle MCP protocol methods
-            if method == "initialize":
-                result = {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "serverInfo": {
-                        "name": "universal-project-mcp",
-                        "version": "2.0.0"
-                    }
-                }
-            elif method == "initialized":
-                result = {}
-            elif method == "tools/list":
-                result = {
-                    "tools": [
-                        {
-                            "name": "set_project_path",
-                            "description": "Set the project root path and save it for future use",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "path": {"type": "string", "description": "Absolute or relative path to project directory"}
-                                },
-                                "required": ["path"]
-                            }
-                        },
-                        {
-                            "name": "get_project_path",
-                            "description": "Get the current project root path",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        },
-                        {
-                            "name": "get_structure",
-                            "description": "Get project directory structure with configurable depth",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "path": {"type": "string", "description": "Path relative to project root"},
-                                    "max_depth": {"type": "integer", "description": "Maximum depth to traverse", "default": 2}
-                                }
-                            }
-                        },
-                        {
-                            "name": "read_file",
-                            "description": "Read file content with optional line range",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "file_path": {"type": "string", "description": "Path to file relative to project root"},
-                                    "start_line": {"type": "integer", "description": "Start line number", "default": 1},
-                                    "end_line": {"type": "integer", "description": "End line number"}
-                                },
-                                "required": ["file_path"]
-                            }
-                        },
-                        {
-                            "name": "search_files",
-                            "description": "Search for files by pattern and optionally in content",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "pattern": {"type": "string", "description": "File name pattern (supports wildcards)", "default": "*"},
-                                    "path": {"type": "string", "description": "Path to search in"},
-                                    "include_content": {"type": "boolean", "description": "Search within file content", "default": False},
-                                    "file_extensions": {"type": "array", "items": {"type": "string"}, "description": "Filter by file extensions"},
-                                    "max_results": {"type": "integer", "description": "Maximum results to return", "default": 100}
-                                }
-                            }
-                        },
-                        {
-                            "name": "list_directory",
-                            "description": "List directory contents (flat view)",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "path": {"type": "string", "description": "Directory path relative to project root"}
-                                }
-                            }
-                        },
-                        {
-                            "name": "get_file_info",
-                            "description": "Get detailed file information",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "file_path": {"type": "string", "description": "Path to file relative to project root"}
-                                },
-                                "required": ["file_path"]
-                            }
-                        },
-                        {
-                            "name": "get_project_summary",
-                            "description": "Get comprehensive project overview and analysis",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        },
-                        {
-                            "name": "get_dependencies",
-                            "description": "Extract and analyze project dependencies from various config files",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        },
-                        {
-                            "name": "find_entry_points",
-                            "description": "Find main entry points and important files of the application",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        },
-                        {
-                            "name": "search_in_files", 
-                            "description": "Search for keyword within file contents and return matching files with context",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "keyword": {"type": "string", "description": "Keyword to search for"},
-                                    "path": {"type": "string", "description": "Path to search in (relative to project root)"},
-                                    "file_extensions": {"type": "array", "items": {"type": "string"}, "description": "Filter by file extensions (e.g. ['.py', '.js'])"},
-                                    "max_results": {"type": "integer", "description": "Maximum number of files to return", "default": 50},
-                                    "case_sensitive": {"type": "boolean", "description": "Whether search should be case sensitive", "default": False},
-                                    "max_matches_per_file": {"type": "integer", "description": "Maximum matches to show per file", "default": 10}
-                                },
-                                "required": ["keyword"]
-                            }
-                        },
-                    ]
-                }
-            elif method == "tools/call":
-                tool_name = params.get("name")
-                arguments = params.get("arguments", {})
-                
-                # Route to methods
-                if tool_name == "set_project_path":
-                    tool_result = mcp.set_project_path(**arguments)
-                elif tool_name == "get_project_path":
-                    tool_result = mcp.get_project_path(**arguments)
-                elif tool_name == "get_structure":
-                    tool_result = mcp.get_structure(**arguments)
-                elif tool_name == "read_file":
-                    tool_result = mcp.read_file(**arguments)
-                elif tool_name == "search_files":
-                    tool_result = mcp.search_files(**arguments)
-                elif tool_name == "search_in_files":
-                    tool_result = mcp.search_in_files(**arguments)
-                elif tool_name == "list_directory":
-                    tool_result = mcp.list_directory(**arguments)
-                elif tool_name == "get_file_info":
-                    tool_result = mcp.get_file_info(**arguments)
-                elif tool_name == "get_project_summary":
-                    tool_result = mcp.get_project_summary(**arguments)
-                elif tool_name == "get_dependencies":
-                    tool_result = mcp.get_dependencies(**arguments)
-                elif tool_name == "find_entry_points":
-                    tool_result = mcp.find_entry_points(**arguments)
-                else:
-                    tool_result = {"error": f"Unknown tool: {tool_name}"}
-                
-                # Format result for MCP
-                result = {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(tool_result, indent=2)
-                        }
-                    ]
-                }
+            # Strip once, and let logging format the payload only when debug is enabled
+            line = line.strip()
+            logging.debug("Received: %s", line)
+            request = json.loads(line)
+            
+            # A JSON-RPC batch is answered with one array, written and flushed once
+            if request == []:
+                # JSON-RPC 2.0: an empty batch gets a single Invalid Request error
+                response_json = json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": None,
+                    "error": {"code": -32600, "message": "Invalid Request"}
+                })
+            elif isinstance(request, list):
+                response_json = "[" + ", ".join(_handle_request(mcp, item) for item in request) + "]"
             else:
-                result = {"error": f"Unknown method: {method}"}
-            
-            # Send response
-            response = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": result
-            }
-            
-            response_json = json.dumps(response)
-            logging.debug(f"Sending response: {response_json}")
+                response_json = _handle_request(mcp, request)
+
+            logging.debug("Sending response: %s", response_json)
             
-            print(response_json)
+            sys.stdout.write(response_json + "\n")
             sys.stdout.flush()
             
-        except json.JSONDecodeError as e:
-            logging.error(f"JSON decode error: {e}")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logging.error("JSON decode error: %s", e)
             continue
         except Exception as e:
-            logging.error(f"Error processing request: {e}")
+            # Anything else (e.g. RecursionError on deeply nested input) is reported, not fatal
+            logging.error("Error processing request: %s", e)
             error_response = {
                 "jsonrpc": "2.0",
-                "id": request.get("id") if 'request' in locals() else None,
+                "id": None,
                 "error": {"code": -1, "message": str(e)}
             }
-            print(json.dumps(error_response))
+            sys.stdout.write(json.dumps(error_response) + "\n")
             sys.stdout.flush()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()